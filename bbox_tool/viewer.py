@@ -1,34 +1,188 @@
 import os
+import math
+import hashlib
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import matplotlib
-matplotlib.use("Qt5Agg") 
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.widgets import RectangleSelector, Button
 from pyproj import Transformer
+from pyproj.enums import TransformDirection
+import rasterio
+from rasterio import Affine
+from rasterio.windows import Window, from_bounds
 import rioxarray as rxr
+import xarray as xr
+
+# Concurrent raster reads; beyond a few the disk, not the CPU, is the limit
+_MAX_READ_WORKERS = 4
+
+try:
+    import numba
+except ImportError:  # optional: falls back to in-place NumPy operations
+    numba = None
+
+
+def _percentiles(img, lower, upper):
+    """
+    Return the (lower, upper) percentiles of img, matching np.percentile's
+    linear interpolation but using a partial sort (np.partition) instead
+    of a full one.
+    """
+    flat = np.ravel(img)
+    n = flat.size
+    positions = [q / 100 * (n - 1) for q in (lower, upper)]
+    kth = sorted({min(int(pos) + step, n - 1) for pos in positions for step in (0, 1)})
+    part = np.partition(flat, kth)
+
+    values = []
+    for pos in positions:
+        lo = int(pos)
+        hi = min(lo + 1, n - 1)
+        values.append(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+    return values[0], values[1]
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _stretch_kernel(flat, p_low, scale, gamma, out):
+        """Single-pass normalise, clip to [0, 1] and gamma over a flat array."""
+        for i in numba.prange(flat.size):
+            v = (flat[i] - p_low) * scale
+            v = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+            out[i] = v if gamma == 1.0 else v ** gamma
+
+
+def _stretch(img, p_low, p_high, gamma=1.0):
+    """
+    Linearly stretch img so p_low -> 0 and p_high -> 1, clip to [0, 1]
+    and optionally apply a gamma, returning a new float64 array.
+    """
+    img = np.asarray(img)
+    scale = np.float64(1.0) / np.float64(p_high - p_low)
+
+    if numba is not None:
+        out = np.empty(img.shape, dtype=np.float64)
+        _stretch_kernel(np.ascontiguousarray(img).ravel(), np.float64(p_low),
+                        scale, np.float64(gamma), out.ravel())
+        return out
+
+    # Without numba, reuse one buffer instead of allocating a temporary per step
+    out = np.subtract(img, p_low, dtype=np.float64)
+    out *= scale
+    np.clip(out, 0, 1, out=out)
+    if gamma != 1.0:
+        np.power(out, gamma, out=out)
+    return out
+
+
+def _to_uint8(arr):
+    """Quantise a [0, 1] float array to uint8 (0-255) for faster imshow rendering."""
+    arr = arr * 255
+    arr += 0.5
+    return arr.astype(np.uint8)
+
+
+def _use_qt_backend():
+    """
+    Switch matplotlib to the Qt backend for interactive windows. Done lazily
+    so importing the package, or plotting without showing, needs no GUI.
+    """
+    matplotlib.use("QtAgg")
+
+
+def _fill_nan(arr):
+    """
+    Replace NaN with 0 in place. Integer rasters cannot hold NaN, so they
+    are returned untouched without the extra pass or copy.
+    """
+    if np.issubdtype(arr.dtype, np.floating):
+        np.nan_to_num(arr, copy=False, nan=0)
+    return arr
+
+
+def _open_raster(fp):
+    """
+    Open a single-band raster lazily in its native dtype (masked=False).
+    Pixels are only read from disk when values are requested.
+    """
+    return rxr.open_rasterio(fp, masked=False, cache=False).squeeze()
+
+
+def _extent(ds):
+    """
+    Return [xmin, xmax, ymin, ymax] of a raster's pixel-centre coordinates.
+    Raster coords are monotonic, so only the end values need reading.
+    """
+    x0, x1 = float(ds.x.values[0]), float(ds.x.values[-1])
+    y0, y1 = float(ds.y.values[0]), float(ds.y.values[-1])
+    return [min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)]
+
+
+def _clip_raster(fp, bbox_crs):
+    """
+    Clip a raster to bbox_crs (minx, maxx, miny, maxy), reading only that
+    window from the file, with any NaN replaced by 0. Pixel selection matches
+    rioxarray's clip_box (window bounds rounded outwards).
+    """
+    with rasterio.open(fp) as src:
+        window = from_bounds(bbox_crs[0], bbox_crs[2], bbox_crs[1], bbox_crs[3],
+                             transform=src.transform)
+        (row_start, row_stop), (col_start, col_stop) = window.toranges()
+        rows = slice(min(max(math.floor(row_start), 0), src.height),
+                     min(max(math.ceil(row_stop), 0), src.height))
+        cols = slice(min(max(math.floor(col_start), 0), src.width),
+                     min(max(math.ceil(col_stop), 0), src.width))
+        if rows.start == rows.stop or cols.start == cols.stop:
+            raise ValueError(f"Bounding box does not overlap {fp}.")
+        window = Window.from_slices(rows, cols)
+
+        arr = _fill_nan(src.read(1, window=window))
+        win_transform = src.window_transform(window)
+        # Pixel-centre coordinates, generated from the full-raster transform as rioxarray does
+        centre = src.transform * Affine.translation(0.5, 0.5)
+        crs = src.crs
+
+    cols_idx = np.arange(cols.start, cols.stop)
+    rows_idx = np.arange(rows.start, rows.stop)
+    x, _ = centre * (cols_idx, np.zeros(cols_idx.size))
+    _, y = centre * (np.zeros(rows_idx.size), rows_idx)
+    ds = xr.DataArray(arr, dims=("y", "x"), coords={"y": y, "x": x})
+    # In place, so the clipped pixels are not copied again
+    ds.rio.write_crs(crs, inplace=True)
+    ds.rio.write_transform(win_transform, inplace=True)
+    return ds
+
 
 class BBoxViewer:
-    def __init__(self, base_path, years=None):
+    def __init__(self, base_path, years=None, disk_cache=True):
         """
         base_path: folder containing year subfolders, each with 'year.tif'
         years: list of years to process; if None, automatically detected
+        disk_cache: if True, save clipped rasters under <base_path>/.cache
+            so later runs can reuse them (see clear_cache())
         """
         self.base_path = base_path
-        # Ensure years are strings for path operations
+        # Ensure years are strings for path operations; hidden folders such as .cache are skipped
         self.years = [str(y) for y in (years or sorted([
             name for name in os.listdir(base_path)
-            if os.path.isdir(os.path.join(base_path, name))
+            if os.path.isdir(os.path.join(base_path, name)) and not name.startswith(".")
         ]))]
+        self.disk_cache = disk_cache
         self.datasets = []
         self.bbox_latlon = None
         self.bbox_crs = None
         self.transform = None
+        self._affine_mat = None
         self.crs = None
         self.to_latlon = None
         self.from_latlon = None
         self.image = None
         self.colourbar_on = True
         self.colourbar_label = "Normalised reflectance"
+        self._clip_cache = {}
 
     def bbox_coords(self, lon_min, lon_max, lat_min, lat_max):
         """
@@ -38,10 +192,10 @@ class BBoxViewer:
         self.bbox_latlon = (lon_min, lon_max, lat_min, lat_max)
         if self.from_latlon is None:
             raise RuntimeError("Load data first with load_data() to set CRS.")
-        x1c, y1c = self.from_latlon.transform(lon_min, lat_min)
-        x2c, y2c = self.from_latlon.transform(lon_max, lat_max)
-        self.bbox_crs = (min(x1c, x2c), max(x1c, x2c),
-                        min(y1c, y2c), max(y1c, y2c))
+        xs, ys = self.from_latlon.transform([lon_min, lon_max], [lat_min, lat_max],
+                                            direction=TransformDirection.FORWARD)
+        self.bbox_crs = (min(xs), max(xs), min(ys), max(ys))
+        self._clip_cache.clear()
         print("Manual LAT/LON bounding box set:", self.bbox_latlon)
         print("Manual raster CRS bounding box set:", self.bbox_crs)
 
@@ -49,20 +203,46 @@ class BBoxViewer:
     def load_data(self):
         """Load first year's raster to setup coordinate transforms"""
         first_year_path = os.path.join(self.base_path, self.years[0], f"{self.years[0]}.tif")
-        ds = rxr.open_rasterio(first_year_path).squeeze()
-        self.image = np.nan_to_num(ds.values, nan=0)
+        # Only metadata is read here; pixels are loaded by select_bbox() if needed
+        ds = _open_raster(first_year_path)
+        self.image = None
         self.transform = ds.rio.transform()
+        t = self.transform
+        self._affine_mat = np.array([[t[0], t[1], t[2]],
+                                     [t[3], t[4], t[5]]], dtype=np.float64)
         self.crs = ds.rio.crs
         self.to_latlon = Transformer.from_crs(self.crs, "EPSG:4326", always_xy=True)
         self.from_latlon = Transformer.from_crs("EPSG:4326", self.crs, always_xy=True)
 
+    def pix_to_map(self, px, py):
+        """
+        Convert pixel column/row indices of the first year's raster to map
+        coordinates in its CRS. Accepts scalars or arrays; returns (X, Y) arrays.
+        """
+        if self._affine_mat is None:
+            raise RuntimeError("Load data first with load_data() to set the transform.")
+        px, py = np.broadcast_arrays(np.asarray(px, dtype=np.float64),
+                                     np.asarray(py, dtype=np.float64))
+        pixels = np.stack([px.ravel(), py.ravel(), np.ones(px.size)])
+        X, Y = self._affine_mat @ pixels
+        return X.reshape(px.shape), Y.reshape(py.shape)
+
     def select_bbox(self):
         """Open interactive Qt window to select bounding box and confirm"""
         if self.bbox_latlon is not None:
             print("Bounding box already set manually, skipping interactive selection.")
             return
+        if self.image is None:
+            first_year_path = os.path.join(self.base_path, self.years[0], f"{self.years[0]}.tif")
+            self.image = _fill_nan(_open_raster(first_year_path).values)
+
+        # Decimate large previews; the extent keeps axes in full-resolution pixel coordinates
+        height, width = self.image.shape
+        step = 4 if height > 2000 else 1
+        _use_qt_backend()
         fig, ax = plt.subplots(figsize=(10, 10))
-        ax.imshow(self.image, cmap="gray", origin='upper')
+        ax.imshow(self.image[::step, ::step], cmap="gray", origin='upper',
+                  extent=(-0.5, width - 0.5, height - 0.5, -0.5))
         ax.set_title(f"Draw bounding box on {self.years[0]} image → click CONFIRM", fontsize=12)
         plt.axis("off")
 
@@ -72,27 +252,24 @@ class BBoxViewer:
             xmin_p, xmax_p = sorted([x1p, x2p])
             ymin_p, ymax_p = sorted([y1p, y2p])
 
-            def pix_to_map(px, py):
-                X = self.transform[2] + px * self.transform[0]
-                Y = self.transform[5] + py * self.transform[4]
-                return X, Y
-
-            x1m, y1m = pix_to_map(xmin_p, ymin_p)
-            x2m, y2m = pix_to_map(xmax_p, ymax_p)
+            xm, ym = self.pix_to_map([xmin_p, xmax_p], [ymin_p, ymax_p])
 
-            lon1, lat1 = self.to_latlon.transform(x1m, y1m)
-            lon2, lat2 = self.to_latlon.transform(x2m, y2m)
-            self.bbox_latlon = (min(lon1, lon2), max(lon1, lon2),
-                                min(lat1, lat2), max(lat1, lat2))
+            # Both corners go through pyproj in one call per direction
+            lons, lats = self.to_latlon.transform(xm, ym, direction=TransformDirection.FORWARD)
+            self.bbox_latlon = (float(lons.min()), float(lons.max()),
+                                float(lats.min()), float(lats.max()))
 
-            x1c, y1c = self.from_latlon.transform(self.bbox_latlon[0], self.bbox_latlon[2])
-            x2c, y2c = self.from_latlon.transform(self.bbox_latlon[1], self.bbox_latlon[3])
-            self.bbox_crs = (min(x1c, x2c), max(x1c, x2c),
-                             min(y1c, y2c), max(y1c, y2c))
+            xs, ys = self.from_latlon.transform(
+                [self.bbox_latlon[0], self.bbox_latlon[1]], [self.bbox_latlon[2], self.bbox_latlon[3]],
+                direction=TransformDirection.FORWARD
+            )
+            self.bbox_crs = (min(xs), max(xs), min(ys), max(ys))
+            self._clip_cache.clear()
 
         rect_selector = RectangleSelector(
             ax, update_bbox,
             interactive=True,
+            useblit=True,
             drag_from_anywhere=True,
             minspanx=10,
             minspany=10,
@@ -110,10 +287,81 @@ class BBoxViewer:
 
         plt.show()
 
+    def _get_clipped(self):
+        """
+        Return every year's raster clipped to the bounding box, reading files
+        in parallel threads. Results are cached per bbox so apply_bbox_to_all()
+        and plot_results() don't re-read the same windows. The cached arrays
+        are shared with callers, so they are made read-only to stop changes
+        leaking back into the cache.
+        """
+        key = (self.bbox_crs, tuple(self.years))
+        cached = self._clip_cache.get(key)
+        if cached is None:
+            with ThreadPoolExecutor(max_workers=min(len(self.years), _MAX_READ_WORKERS)) as executor:
+                cached = list(executor.map(self._load_clipped, self.years))
+            for ds in cached:
+                ds.values.flags.writeable = False
+            self._clip_cache[key] = cached
+        return list(cached)
+
+    @property
+    def cache_dir(self):
+        """Folder holding the on-disk clip cache."""
+        return os.path.join(self.base_path, ".cache")
+
+    def clear_cache(self):
+        """
+        Delete all cached clips, both in memory and on disk. The disk cache
+        is never evicted automatically, so each new bbox adds one file pair
+        per year until this is called.
+        """
+        self._clip_cache.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _cache_paths(self, yr):
+        """Paths of the on-disk clip cache for one year and the current bbox."""
+        key = hashlib.md5(f"{self.bbox_crs}".encode()).hexdigest()[:12]
+        stem = os.path.join(self.cache_dir, f"{yr}_{key}")
+        return f"{stem}.npy", f"{stem}_coords.npz"
+
+    def _load_clipped(self, yr):
+        """
+        Return one year's raster clipped to the bounding box. With disk_cache
+        on, clips are saved under <base_path>/.cache and memory-mapped on later
+        runs, so the TIFF is only decoded again if it is newer than its cached clip.
+        """
+        fp = os.path.join(self.base_path, yr, f"{yr}.tif")
+        if not self.disk_cache:
+            return _clip_raster(fp, self.bbox_crs)
+        arr_path, coords_path = self._cache_paths(yr)
+
+        if (os.path.exists(arr_path) and os.path.exists(coords_path)
+                and os.path.getmtime(arr_path) >= os.path.getmtime(fp)):
+            with np.load(coords_path) as coords:
+                ds = xr.DataArray(np.load(arr_path, mmap_mode="r"), dims=("y", "x"),
+                                  coords={"y": coords["y"], "x": coords["x"]})
+            # In place, so the memory map is not copied into RAM
+            return ds.rio.write_crs(self.crs, inplace=True)
+
+        ds = _clip_raster(fp, self.bbox_crs)
+        try:
+            os.makedirs(os.path.dirname(arr_path), exist_ok=True)
+            np.savez(coords_path, x=ds.x.values, y=ds.y.values)
+            # Write then rename, so a partly written array is never picked up
+            with open(f"{arr_path}.tmp", "wb") as f:
+                np.save(f, ds.values)
+            os.replace(f"{arr_path}.tmp", arr_path)
+        except OSError:
+            pass  # e.g. read-only data folder: carry on without the disk cache
+        return ds
+
     def apply_bbox_to_all(self):
         """
         Clip all rasters using the selected bounding box
         and return dict of clipped arrays and spatial extents.
+        The arrays are read-only views of the clip cache; call .copy() on
+        one before modifying it.
         """
         if self.bbox_crs is None:
             raise ValueError("Bounding box not set. Run select_bbox() first.")
@@ -121,34 +369,18 @@ class BBoxViewer:
         clipped = {}
         extents = {}
 
-        for yr in self.years:
-            fp = os.path.join(self.base_path, yr, f"{yr}.tif")
-            ds = rxr.open_rasterio(fp).squeeze()
-
-            ds = ds.rio.clip_box(
-                minx=self.bbox_crs[0], maxx=self.bbox_crs[1],
-                miny=self.bbox_crs[2], maxy=self.bbox_crs[3]
-            )
+        for yr, ds in zip(self.years, self._get_clipped()):
+            clipped[yr] = ds.values
 
-            arr = np.nan_to_num(ds.values, nan=0)
-            clipped[yr] = arr
-
-            extents[yr] = [
-                ds.x.min().item(),
-                ds.x.max().item(),
-                ds.y.min().item(),
-                ds.y.max().item()
-            ]
+            extents[yr] = _extent(ds)
 
         return clipped, extents
 
     @staticmethod
     def preprocess(img):
         """Normalise image using 2–98 percentile stretch"""
-        p2, p98 = np.percentile(img, (2, 98))
-        stretched = np.clip((img - p2) / (p98 - p2), 0, 1)
-        stretched = np.power(stretched, 0.8)
-        return stretched
+        p2, p98 = _percentiles(img, 2, 98)
+        return _stretch(img, p2, p98, gamma=0.8)
 
     def set_colourbar(self, on=True, label="Normalised reflectance"):
         """
@@ -165,22 +397,28 @@ class BBoxViewer:
         self.colourbar_label = label
 
     def normalised_viewer(self, image, title="Normalised View", lower_percentile=2, upper_percentile=98, cmap="gray"):
-        p_low, p_high = np.percentile(image, [lower_percentile, upper_percentile])
-        stretched = np.clip((image - p_low) / (p_high - p_low), 0, 1)
+        p_low, p_high = _percentiles(image, lower_percentile, upper_percentile)
+        stretched = _stretch(image, p_low, p_high)
 
+        _use_qt_backend()
         plt.figure(figsize=(6, 6))
-        im_plot = plt.imshow(stretched, cmap=cmap)
+        plt.imshow(_to_uint8(stretched), cmap=cmap, vmin=0, vmax=255)
         plt.title(title)
 
         if self.colourbar_on:
-            cbar = plt.colorbar(im_plot)
+            # Colourbar keeps the normalised 0-1 scale while the image is drawn as uint8
+            from matplotlib.cm import ScalarMappable
+            from matplotlib.colors import Normalize
+            sm = ScalarMappable(cmap=cmap, norm=Normalize(vmin=0, vmax=1))
+            cbar = plt.colorbar(sm, ax=plt.gca())
             cbar.set_label(self.colourbar_label, rotation=90)
             cbar.set_ticks([0, 0.2, 0.4, 0.6, 0.8, 1.0])
 
         plt.axis("off")
         plt.show()
 
-    def plot_results(self, titles=None, save=True, save_path=None, lower_percentile=2, upper_percentile=98, cmap="gray"):
+    def plot_results(self, titles=None, save=True, save_path=None, lower_percentile=2, upper_percentile=98, cmap="gray",
+                     shared_stretch=False, show=True, save_dpi=300):
         """
         Plot clipped rasters stacked vertically with optional custom titles,
         normalisation, and a single shared colourbar.
@@ -199,47 +437,73 @@ class BBoxViewer:
             Upper percentile for normalisation.
         cmap : str
             Matplotlib colormap.
+        shared_stretch : bool
+            If True, apply one stretch to every year, taken from the percentiles
+            of a subsample (every 8th pixel) of all clipped rasters together.
+            If False, each year is stretched using its own percentiles.
+        show : bool
+            Whether to open the figure in a Qt window. If False, the figure is
+            rendered off-screen (e.g. for batch jobs that only save it).
+        save_dpi : int
+            Resolution of the saved figure. The on-screen figure is drawn at
+            100 dpi and only re-rasterised at this resolution when saving.
         """
         if self.bbox_crs is None:
             raise ValueError("Bounding box not set. Run select_bbox() first.")
 
-        self.datasets = []
-        for yr in self.years:
-            fp = os.path.join(self.base_path, yr, f"{yr}.tif")
-            ds = rxr.open_rasterio(fp).squeeze()
-            ds = ds.rio.clip_box(
-                minx=self.bbox_crs[0], maxx=self.bbox_crs[1],
-                miny=self.bbox_crs[2], maxy=self.bbox_crs[3]
-            )
-            self.datasets.append(ds)
-
-        crs = self.datasets[0].rio.crs
-        transformer = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
-
-        fig, axes = plt.subplots(
-            nrows=len(self.datasets), ncols=1,
-            figsize=(10, 5*len(self.datasets)), dpi=300
-        )
+        self.datasets = self._get_clipped()
+
+        if shared_stretch:
+            sample = np.concatenate([ds.values[::8, ::8].ravel() for ds in self.datasets])
+            shared_p_low, shared_p_high = _percentiles(sample, lower_percentile, upper_percentile)
+
+        # Reuse the transformer built in load_data() rather than rebuilding it per plot
+        assert self.datasets[0].rio.crs == self.crs, "Rasters must share the CRS of the first year."
+
+        # Draw on screen at 100 dpi; savefig re-rasterises at save_dpi
+        screen_dpi = 100
+        figsize = (10, 5*len(self.datasets))
+        if show:
+            _use_qt_backend()
+            fig, axes = plt.subplots(nrows=len(self.datasets), ncols=1, figsize=figsize, dpi=screen_dpi)
+        else:
+            # Plain Figure renders with Agg without touching pyplot or the GUI backend
+            fig = Figure(figsize=figsize, dpi=screen_dpi)
+            axes = fig.subplots(nrows=len(self.datasets), ncols=1)
+        # Pixel budget of one axis; larger rasters are strided down to it before imshow
+        render_dpi = max(fig.dpi, save_dpi) if save else fig.dpi
+        fig_w_px, fig_h_px = int(10 * render_dpi), int(5 * render_dpi)
 
         if len(self.datasets) == 1:
             axes = [axes]
 
         im_list = []
 
-        for ax, ds, yr in zip(axes, self.datasets, self.years):
+        # Tick positions for every axis, converted to lat/lon in one batched call
+        n_ticks = 5
+        ds_extents = [_extent(ds) for ds in self.datasets]
+        all_xticks = np.concatenate([np.linspace(ext[0], ext[1], n_ticks) for ext in ds_extents])
+        all_yticks = np.concatenate([np.linspace(ext[2], ext[3], n_ticks) for ext in ds_extents])
+        all_lons, all_lats = self.to_latlon.transform(all_xticks, all_yticks, direction=TransformDirection.FORWARD)
+
+        for i, (ax, ds, yr) in enumerate(zip(axes, self.datasets, self.years)):
             # Normalisation
-            p_low, p_high = np.percentile(ds.values, [lower_percentile, upper_percentile])
-            arr = np.clip((ds.values - p_low) / (p_high - p_low), 0, 1)
-            im = ax.imshow(arr, cmap=cmap,
-                        extent=[ds.x.min(), ds.x.max(), ds.y.min(), ds.y.max()],
+            if shared_stretch:
+                p_low, p_high = shared_p_low, shared_p_high
+            else:
+                p_low, p_high = _percentiles(ds.values, lower_percentile, upper_percentile)
+            stride_y = max(1, ds.shape[0] // fig_h_px)
+            stride_x = max(1, ds.shape[1] // fig_w_px)
+            arr = _stretch(ds.values[::stride_y, ::stride_x], p_low, p_high)
+            im = ax.imshow(_to_uint8(arr), cmap=cmap, vmin=0, vmax=255,
+                        extent=ds_extents[i],
                         origin="upper", aspect="equal")
             im_list.append(im)
 
             # Tick conversion to lat/lon
-            xlim, ylim = ax.get_xlim(), ax.get_ylim()
-            xticks = np.linspace(xlim[0], xlim[1], 5)
-            yticks = np.linspace(ylim[0], ylim[1], 5)
-            lons, lats = transformer.transform(xticks, yticks)
+            tick_slice = slice(i * n_ticks, (i + 1) * n_ticks)
+            xticks, yticks = all_xticks[tick_slice], all_yticks[tick_slice]
+            lons, lats = all_lons[tick_slice], all_lats[tick_slice]
 
             ax.set_xticks(xticks)
             ax.set_yticks(yticks)
@@ -263,8 +527,10 @@ class BBoxViewer:
 
         # Single shared colourbar
         if self.colourbar_on and im_list:
+            # Images are drawn as uint8, so the colourbar gets its own 0-1 norm
             from matplotlib.cm import ScalarMappable
-            sm = ScalarMappable(cmap=cmap, norm=im_list[0].norm)
+            from matplotlib.colors import Normalize
+            sm = ScalarMappable(cmap=cmap, norm=Normalize(vmin=0, vmax=1))
             sm.set_array([])
             cbar = fig.colorbar(sm, ax=axes, fraction=0.046, pad=0.04)
             cbar.set_label(self.colourbar_label, rotation=90, fontsize=10)
@@ -273,7 +539,8 @@ class BBoxViewer:
         if save:
             save_path = save_path or os.path.join(self.base_path, "deposit", "stacked_rasters.png")
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            fig.savefig(save_path, dpi=300, bbox_inches="tight")
+            fig.savefig(save_path, dpi=save_dpi, bbox_inches="tight")
             print(f"Saved: {save_path}")
 
-        plt.show()
+        if show:
+            plt.show()
@@ -12,6 +12,9 @@ setup(
         "pyproj",
         "ipywidgets"
     ],
+    extras_require={
+        "fast": ["numba"]
+    },
     python_requires='>=3.10',
     include_package_data=True,
     description="Interactive bounding box tool for visualising raster changes across years",